@@ -24,7 +24,7 @@ PREVIOUS v3.2 FEATURES:
 ✅ Kalkulator Target Kejar Tumbuh - Growth velocity monitoring profesional
 ✅ Bug Fix - HTML rendering di checklist wizard
 
-RUN: python app.py
+RUN: python server.py
 """
 
 # ===============================================================================
@@ -38,16 +38,24 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Core Python
+import bisect
 import io
 import csv
+import gc
+import gzip
+import hashlib
+import itertools
 import math
 import json
 import random
+import threading
 import traceback
 import warnings
+from collections import deque
 from datetime import datetime, date, timedelta
 from functools import lru_cache
-from typing import Dict, List, Tuple, Optional, Any, Union
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional, Any, Union, Mapping
 
 # Suppress warnings for cleaner logs
 warnings.filterwarnings('ignore')
@@ -63,39 +71,32 @@ except ImportError as e:
 
 # Scientific Computing
 import numpy as np
-from scipy.special import erf
-import pandas as pd
-
-# Visualization
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend for server
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-plt.ioff()  # Disable interactive mode
-plt.rcParams.update({
-    'figure.max_open_warning': 0,  # Prevent memory leak warnings
-    'figure.dpi': 100,
-    'savefig.dpi': 150,
-    'savefig.bbox': 'tight',
-})
-
-# Image Processing
-from PIL import Image
-import qrcode
+from scipy.special import erf, ndtri
 
-# PDF Generation
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-from reportlab.lib import colors as rl_colors
-from reportlab.lib.units import cm
+# JIT Compilation (optional - falls back to pure NumPy)
+try:
+    from numba import njit, vectorize
+    NUMBA_AVAILABLE = True
+    print("✅ Numba JIT available for LMS kernels")
+except ImportError:
+    NUMBA_AVAILABLE = False
+    print("⚠️  Numba not installed - LMS kernels will use NumPy")
+
+# Heavy, rarely-used libraries (pandas, qrcode, reportlab) are imported
+# lazily inside the functions that need them to keep cold start and worker RAM low.
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Flask Framework
-from flask import Flask, render_template, request, jsonify, redirect, url_for, send_file, flash, session
+from flask import (Flask, render_template, request, redirect, url_for, send_file, flash, session,
+                   Response, stream_with_context, abort)
+from werkzeug.exceptions import HTTPException, InternalServerError
+from werkzeug.http import parse_etags, unquote_etag
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
-# HTTP Requests
-import requests
+# Fast JSON serialization (C implementation, native NumPy support)
+import orjson
 
 print("✅ All imports successful")
 
@@ -194,8 +195,20 @@ BOUNDS = {
     'wfl_l': (45.0, 110.0)   # Weight-for-Length: length range
 }
 
-# Age grid for smooth curve generation (0-60 months, step 0.25)
-AGE_GRID = np.arange(0.0, 60.25, 0.25)
+# Same bounds as parallel arrays (position = BOUNDS key order) for vectorised checks
+_BOUNDS_INDEX = {kind: i for i, kind in enumerate(BOUNDS)}
+_BOUNDS_LO = np.array([lo for lo, _ in BOUNDS.values()], dtype=np.float32)
+_BOUNDS_HI = np.array([hi for _, hi in BOUNDS.values()], dtype=np.float32)
+
+# Accepted request values (membership tests against prebuilt frozensets)
+_VALID_GENDERS = frozenset(('M', 'F'))
+_VALID_TYPES = frozenset(('wfa', 'hfa', 'wfh', 'bfa', 'hcfa'))
+_USES_WEIGHT = frozenset(('wfa', 'wfh', 'bfa', 'hcfa'))  # hcfa reads head circumference from weight
+_USES_HEIGHT = frozenset(('hfa', 'wfh', 'bfa'))
+
+# Age grid for smooth curve generation (0-60 months, step 0.25). Only this grid and the
+# plotted reference curves are float32; LMS tables stay float64 for z-score accuracy
+AGE_GRID = np.arange(0.0, 60.25, 0.25, dtype=np.float32)
 
 # UI Themes (Pastel Professional)
 UI_THEMES = {
@@ -519,13 +532,81 @@ ARTIKEL_LOKAL_DATABASE = [
     }
 ]
 
+# Freeze articles (read-only views) and index them once at startup
+ARTIKEL_LOKAL_DATABASE = tuple(MappingProxyType(a) for a in ARTIKEL_LOKAL_DATABASE)
+
+_ARTIKEL_BY_CATEGORY: Dict[str, List[Mapping[str, Any]]] = {}
+for _artikel in ARTIKEL_LOKAL_DATABASE:
+    _ARTIKEL_BY_CATEGORY.setdefault(_artikel['kategori'], []).append(_artikel)
+
+# Newest first, matching the library page's default sort
+_ARTIKEL_BY_DATE = sorted(ARTIKEL_LOKAL_DATABASE, key=lambda a: a['tanggal'], reverse=True)
+
+def _freeze(obj: Any) -> Any:
+    """Recursively turn dicts into read-only views (interned str keys) and lists into tuples"""
+    if isinstance(obj, dict):
+        return MappingProxyType({
+            (sys.intern(k) if isinstance(k, str) else k): _freeze(v) for k, v in obj.items()
+        })
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+def _script_json(obj: Any) -> str:
+    """Serialize obj once for an inline <script> (HTML-sensitive chars escaped like |tojson)"""
+    raw = orjson.dumps(obj, default=dict, option=orjson.OPT_NON_STR_KEYS).decode()
+    return (raw.replace('<', '\\u003c').replace('>', '\\u003e')
+               .replace('&', '\\u0026').replace("'", '\\u0027'))
+
+# Static config handed to templates on every request: freeze once at startup
+PREMIUM_PACKAGES = _freeze(PREMIUM_PACKAGES)
+NOTIFICATION_TEMPLATES = _freeze(NOTIFICATION_TEMPLATES)
+UI_THEMES = _freeze(UI_THEMES)
+IMMUNIZATION_SCHEDULE = _freeze(IMMUNIZATION_SCHEDULE)
+KPSP_QUESTIONS = _freeze(KPSP_QUESTIONS)
+KPSP_YOUTUBE_VIDEOS = _freeze(KPSP_YOUTUBE_VIDEOS)
+MPASI_YOUTUBE_VIDEOS = _freeze(MPASI_YOUTUBE_VIDEOS)
+
+# KPSP question sets as a JSON literal for the screening page's script
+_KPSP_JSON = _script_json(KPSP_QUESTIONS)
+
+# Sorted KPSP age groups for binary-search lookup of the applicable set
+_KPSP_AGES = tuple(sorted(KPSP_QUESTIONS))
+
+# KPSP verdicts, best first: (minimum fraction of "yes", result, color, recommendation)
+_KPSP_VERDICTS = (
+    (0.8, "Perkembangan Sesuai Usia", "#4caf50",
+     "Pertumbuhan dan perkembangan anak sesuai usia. Terus lakukan stimulasi."),
+    (0.6, "Perkembangan Terduga Terlambat", "#ff9800",
+     "Perlu stimulasi intensif dan pemantauan lebih lanjut."),
+    (0.0, "Perkembangan Terlambat", "#f44336",
+     "Segera konsultasikan dengan dokter anak untuk evaluasi lebih lanjut."),
+)
+
+# Same lookups as arrays for the batch endpoint
+_KPSP_AGES_ARR = np.array(_KPSP_AGES, dtype=np.float64)
+_KPSP_COUNTS = np.array([len(KPSP_QUESTIONS[age]) for age in _KPSP_AGES], dtype=np.int64)
+_KPSP_FRACTIONS = np.array([v[0] for v in _KPSP_VERDICTS], dtype=np.float64)
+KPSP_BATCH_MAX = 5000
+
+# Content counts, computed once (config tables are frozen, so they never change)
+CONTENT_COUNTS = MappingProxyType({
+    "kpsp_videos": len(KPSP_YOUTUBE_VIDEOS),
+    "mpasi_videos": sum(len(v) for v in MPASI_YOUTUBE_VIDEOS.values()),
+    "mpasi_age_groups": len(MPASI_YOUTUBE_VIDEOS),
+    "immunization_schedules": len(IMMUNIZATION_SCHEDULE),
+    "kpsp_question_sets": len(KPSP_QUESTIONS),
+    "themes": len(UI_THEMES),
+    "articles": len(ARTIKEL_LOKAL_DATABASE),
+})
+
 print(f"✅ Configuration loaded (v3.3):")
-print(f"   - {len(KPSP_YOUTUBE_VIDEOS)} KPSP videos")
-print(f"   - {sum(len(v) for v in MPASI_YOUTUBE_VIDEOS.values())} MP-ASI videos across {len(MPASI_YOUTUBE_VIDEOS)} age groups")
-print(f"   - {len(IMMUNIZATION_SCHEDULE)} immunization schedules")
-print(f"   - {len(KPSP_QUESTIONS)} KPSP question sets")
-print(f"   - {len(UI_THEMES)} UI themes")
-print(f"   - {len(ARTIKEL_LOKAL_DATABASE)} verified articles (v3.2)")
+print(f"   - {CONTENT_COUNTS['kpsp_videos']} KPSP videos")
+print(f"   - {CONTENT_COUNTS['mpasi_videos']} MP-ASI videos across {CONTENT_COUNTS['mpasi_age_groups']} age groups")
+print(f"   - {CONTENT_COUNTS['immunization_schedules']} immunization schedules")
+print(f"   - {CONTENT_COUNTS['kpsp_question_sets']} KPSP question sets")
+print(f"   - {CONTENT_COUNTS['themes']} UI themes")
+print(f"   - {CONTENT_COUNTS['articles']} verified articles (v3.2)")
 
 # ===============================================================================
 # SECTION 3: WHO CALCULATOR INITIALIZATION
@@ -549,6 +630,43 @@ except Exception as e:
 if calc is None:
     print("⚠️  WARNING: Application will run with limited functionality")
 
+# WHO LMS tables per measurement type (pygrowup 0-5 year, age-indexed tables)
+LMS_TABLE_PREFIXES = {
+    'wfa': 'wfa',     # Weight-for-Age
+    'hfa': 'lhfa',    # Length/Height-for-Age
+    'hcfa': 'hcfa',   # Head Circumference-for-Age
+}
+LMS_SEX_NAMES = {'M': 'boys', 'F': 'girls'}
+
+def load_lms_tables(calculator) -> Dict[str, Dict[str, Tuple[np.ndarray, ...]]]:
+    """Parse pygrowup WHO tables into LMS[kind][gender] = (ages, L, M, S) arrays"""
+    tables = {}
+    if calculator is None:
+        return tables
+
+    for kind, prefix in LMS_TABLE_PREFIXES.items():
+        for gender, sex_name in LMS_SEX_NAMES.items():
+            table = getattr(calculator, f"{prefix}_{sex_name}_0_5", None)
+            if not table:
+                continue
+            entries = table.values() if isinstance(table, dict) else table
+            try:
+                rows = sorted(
+                    (float(row['Month']), float(row['L']), float(row['M']), float(row['S']))
+                    for row in entries if isinstance(row, dict)
+                )
+            except (KeyError, ValueError, TypeError) as e:
+                print(f"⚠️  WARNING: Could not parse LMS table {prefix}_{sex_name}_0_5: {e}")
+                continue
+            if rows:
+                # float64: z-scores are reported to 0.01 and must match pygrowup's Decimal math
+                columns = (np.array(col, dtype=np.float64) for col in zip(*rows))
+                tables.setdefault(kind, {})[gender] = tuple(columns)
+    return tables
+
+LMS = load_lms_tables(calc)
+print(f"✅ WHO LMS tables parsed: {sum(len(v) for v in LMS.values())} tables ({', '.join(LMS) or 'none'})")
+
 print("=" * 80)
 print(f"🚀 {APP_TITLE} v{APP_VERSION} - Configuration Complete")
 print("=" * 80)
@@ -557,10 +675,186 @@ print("=" * 80)
 # SECTION 4: FLASK APP INITIALIZATION
 # ===============================================================================
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (serializes ndarrays/numpy scalars natively)"""
+
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        if isinstance(o, MappingProxyType):
+            return dict(o)
+        if isinstance(o, np.ndarray):
+            return o.tolist()
+        if isinstance(o, np.generic):
+            return o.item()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = self.option
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
 app = Flask(__name__)
 app.secret_key = 'peduligizi-balita-secret-key-2024'
+app.json = OrjsonProvider(app)
 CORS(app)
 
+def ojsonify(obj: Any, status: int = 200) -> Response:
+    """JSON response straight from orjson bytes (no str round-trip, no key sorting)"""
+    return app.response_class(orjson.dumps(obj, default=OrjsonProvider.default, option=OrjsonProvider.option),
+                              status=status, mimetype='application/json')
+
+class GzipMiddleware:
+    """WSGI middleware: gzip buffered text/JSON responses for clients that accept it"""
+
+    COMPRESSIBLE = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+
+    def __init__(self, wsgi_app, min_size: int = 512, compresslevel: int = 1):
+        self.wsgi_app = wsgi_app
+        self.min_size = min_size
+        self.compresslevel = compresslevel  # Level 1: nearly level-6 ratio at a fraction of the CPU
+
+    @classmethod
+    def _varies(cls, status: str, headers: List[Tuple[str, str]]) -> bool:
+        """True if a gzip-capable client could get a different encoding of this response"""
+        h = {k.lower(): v for k, v in headers}
+        if 'content-encoding' in h or 'no-transform' in h.get('cache-control', '').lower():
+            return False
+        # 304s carry no Content-Type; the 200 they revalidate may have been gzipped
+        return status.startswith('304') or h.get('content-type', '').startswith(cls.COMPRESSIBLE)
+
+    @staticmethod
+    def _with_vary(headers: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Headers with Accept-Encoding merged into Vary"""
+        out, vary = [], None
+        for k, v in headers:
+            if k.lower() == 'vary':
+                vary = v
+            else:
+                out.append((k, v))
+        if vary and 'accept-encoding' in vary.lower():
+            out.append(('Vary', vary))
+        else:
+            out.append(('Vary', f'{vary}, Accept-Encoding' if vary else 'Accept-Encoding'))
+        return out
+
+    def _should_compress(self, status: str, headers: List[Tuple[str, str]]) -> bool:
+        if not status.startswith('200'):
+            return False
+        h = {k.lower(): v for k, v in headers}
+        if 'content-encoding' in h:
+            return False
+        # The sender asked intermediaries (us included) not to change the body
+        if 'no-transform' in h.get('cache-control', '').lower():
+            return False
+        # Streamed responses (no Content-Length, e.g. CSV export) pass through untouched
+        length = h.get('content-length')
+        if length is None or int(length) < self.min_size:
+            return False
+        return h.get('content-type', '').startswith(self.COMPRESSIBLE)
+
+    @staticmethod
+    def _revalidated_headers(environ, headers: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """304: weaken the ETag only if the client holds the weak tag of a gzipped 200"""
+        client_etags = parse_etags(environ.get('HTTP_IF_NONE_MATCH'))
+        out = []
+        for k, v in headers:
+            if k.lower() == 'etag':
+                tag, weak = unquote_etag(v)
+                if not weak and client_etags.is_weak(tag):
+                    v = f'W/{v}'
+            out.append((k, v))
+        return out
+
+    @staticmethod
+    def accepts_gzip(header: str) -> bool:
+        """True if Accept-Encoding allows gzip (explicit q-value wins over '*'; q=0 refuses)"""
+        gzip_q = star_q = None
+        for item in header.split(','):
+            coding, _, params = item.strip().partition(';')
+            coding = coding.strip().lower()
+            if coding not in ('gzip', '*'):
+                continue
+            q = 1.0
+            for param in params.split(';'):
+                name, _, value = param.strip().partition('=')
+                if name.strip().lower() == 'q':
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            if coding == 'gzip':
+                gzip_q = q
+            else:
+                star_q = q
+        q = gzip_q if gzip_q is not None else star_q
+        return q is not None and q > 0
+
+    def __call__(self, environ, start_response):
+        # HEAD has no body to compress: its headers must match an identity GET
+        if (environ.get('REQUEST_METHOD') == 'HEAD'
+                or not self.accepts_gzip(environ.get('HTTP_ACCEPT_ENCODING', ''))):
+            # Identity response, but shared caches must still key it on Accept-Encoding
+            def vary_start_response(status, headers, exc_info=None):
+                if self._varies(status, headers):
+                    headers = self._with_vary(headers)
+                return start_response(status, headers, exc_info)
+            return self.wsgi_app(environ, vary_start_response)
+
+        captured = []
+        written = []
+
+        def capture(status, headers, exc_info=None):
+            captured[:] = [status, headers, exc_info]
+            return written.append
+
+        app_iter = self.wsgi_app(environ, capture)
+        status, headers, exc_info = captured
+
+        if not self._should_compress(status, headers):
+            if status.startswith('304'):
+                headers = self._revalidated_headers(environ, headers)
+            if self._varies(status, headers):
+                headers = self._with_vary(headers)
+            start_response(status, headers, exc_info)
+            if written:
+                body = b''.join(written) + b''.join(app_iter)
+                if hasattr(app_iter, 'close'):
+                    app_iter.close()
+                return [body]
+            return app_iter
+
+        try:
+            body = b''.join(written) + b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        compressed = gzip.compress(body, compresslevel=self.compresslevel)
+
+        new_headers = []
+        for k, v in headers:
+            key = k.lower()
+            if key == 'content-length':
+                continue
+            if key == 'etag' and not v.startswith('W/'):
+                v = f'W/{v}'  # Different bytes than the identity representation
+            new_headers.append((k, v))
+        new_headers.append(('Content-Encoding', 'gzip'))
+        new_headers.append(('Content-Length', str(len(compressed))))
+        new_headers = self._with_vary(new_headers)
+
+        start_response(status, new_headers, exc_info)
+        return [compressed]
+
+app.wsgi_app = GzipMiddleware(app.wsgi_app)
+
 # ===============================================================================
 # SECTION 5: UTILITY FUNCTIONS
 # ===============================================================================
@@ -574,6 +868,17 @@ def as_float(x: Any) -> Optional[float]:
     except (ValueError, TypeError):
         return None
 
+def _num(v: Any) -> Optional[float]:
+    """Numbers from the JSON parser pass straight through; anything else goes through as_float"""
+    return v if type(v) is float or type(v) is int else as_float(v)
+
+def _round2(x: Union[float, Any]) -> float:
+    """Round to 2 decimals (half away from zero) with integer arithmetic; accepts Decimal"""
+    x = float(x)
+    if not math.isfinite(x * 100):  # int() cannot take inf/NaN; round() handles them
+        return round(x, 2)
+    return (int(x * 100 + 0.5) if x >= 0 else -int(-x * 100 + 0.5)) / 100.0
+
 def months_to_years_months(months: float) -> str:
     """Convert months to years and months format"""
     years = int(months // 12)
@@ -586,10 +891,34 @@ def months_to_years_months(months: float) -> str:
     else:
         return f"{years} tahun {remaining_months} bulan"
 
+# Motivational quotes: shuffled once, then rotated per request (no RNG call per page)
+_QUOTE_CYCLE = deque(random.sample(MOTIVATIONAL_QUOTES, len(MOTIVATIONAL_QUOTES)))
+_QUOTE_LOCK = threading.Lock()  # Workers run threaded (gthread / threaded=True)
+
+def next_quote() -> str:
+    """Return the next motivational quote from the pre-shuffled cycle"""
+    with _QUOTE_LOCK:
+        quote = _QUOTE_CYCLE[0]
+        _QUOTE_CYCLE.rotate(-1)
+    return quote
+
+_DAYS_PER_MONTH = 30.4375  # Average days per month
+_ONE_DAY = np.timedelta64(1, 'D')
+
+def get_ages_in_months(birth_dates, measurement_dates) -> np.ndarray:
+    """Calculate ages in months for arrays of birth/measurement dates (or datetimes)"""
+    # Subtract at microsecond resolution, then floor to whole days: same as timedelta.days
+    b = np.asarray(birth_dates, dtype='datetime64[us]')
+    m = np.asarray(measurement_dates, dtype='datetime64[us]')
+    d = m - b
+    # Missing dates are NaT; floor division would turn them into 0 days, so map them to NaN
+    with np.errstate(invalid='ignore'):
+        return np.where(np.isnat(d), np.nan, (d // _ONE_DAY) / _DAYS_PER_MONTH)
+
 def get_age_in_months(birth_date: date, measurement_date: date) -> float:
     """Calculate age in months with decimal precision"""
     delta = measurement_date - birth_date
-    return delta.days / 30.4375  # Average days per month
+    return delta.days / _DAYS_PER_MONTH
 
 def validate_measurement(value: float, bounds: tuple, field_name: str) -> bool:
     """Validate measurement against WHO bounds"""
@@ -600,21 +929,107 @@ def validate_measurement(value: float, bounds: tuple, field_name: str) -> bool:
         return False
     return True
 
+def validate_batch(values: np.ndarray, kind: str) -> np.ndarray:
+    """Vectorised bounds check: boolean mask of values within BOUNDS[kind] (NaN -> False)"""
+    i = _BOUNDS_INDEX[kind]
+    values = np.asarray(values, dtype=np.float32)
+    return (values >= _BOUNDS_LO[i]) & (values <= _BOUNDS_HI[i])
+
+def _record_field(record: dict, key: str) -> float:
+    """Record value for the bounds check: NaN if absent/empty, inf if present but not a finite number"""
+    v = record.get(key)
+    if v is None or v == '':
+        return np.nan
+    v = _num(v)
+    return v if v is not None and math.isfinite(v) else np.inf
+
+def invalid_record_rows(records: List[dict]) -> List[int]:
+    """Indices of records with a bad gender/age or weight/height outside WHO bounds (absent values are allowed)"""
+    ages = np.array([_record_field(r, 'age_months') for r in records], dtype=np.float64)
+    weights = np.array([_record_field(r, 'weight') for r in records], dtype=np.float32)
+    heights = np.array([_record_field(r, 'height') for r in records], dtype=np.float32)
+    genders = np.array([r.get('gender') in (None, '') or
+                        (isinstance(r.get('gender'), str) and r['gender'].upper() in _VALID_GENDERS)
+                        for r in records], dtype=bool)
+    ok = (genders & ~np.isinf(ages) &
+          (np.isnan(weights) | validate_batch(weights, 'wfa')) &
+          (np.isnan(heights) | validate_batch(heights, 'hfa')))
+    return np.flatnonzero(~ok).tolist()
+
+def _lms_zscore(x, L, M, S):
+    """WHO LMS z-score for one measurement: ((x/M)^L - 1) / (L*S), or ln(x/M)/S when L == 0"""
+    if L == 0.0:
+        return math.log(x / M) / S
+    return ((x / M) ** L - 1.0) / (L * S)
+
+def _lms_value(L, M, S, z):
+    """Inverse WHO LMS: measurement value at z-score z"""
+    if L == 0.0:
+        return M * math.exp(S * z)
+    return M * (1.0 + L * S * z) ** (1.0 / L)
+
+if NUMBA_AVAILABLE:
+    # Explicit signatures compile eagerly at import, off the request path. No fastmath:
+    # the scalar and the ufunc must give bit-identical z-scores for the same child.
+    _lms_zscore = njit('float64(float64,float64,float64,float64)', cache=True)(_lms_zscore)
+    _lms_value = njit('float64(float64,float64,float64,float64)', cache=True)(_lms_value)
+
+    @vectorize(['f8(f8,f8,f8,f8)'], nopython=True, cache=True)
+    def lms_z(x, L, M, S):
+        """WHO LMS z-score kernel (Numba ufunc over _lms_zscore)"""
+        return _lms_zscore(x, L, M, S)
+
+    @vectorize(['f8(f8,f8,f8,f8)'], nopython=True, cache=True)
+    def lms_percentile(L, M, S, z):
+        """Inverse WHO LMS kernel (Numba ufunc over _lms_value)"""
+        return _lms_value(L, M, S, z)
+else:
+    def lms_z(x, L, M, S):
+        """WHO LMS z-score kernel (NumPy array expression)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = np.asarray(x, dtype=np.float64) / M
+            return np.where(L == 0, np.log(r) / S, (r ** L - 1.0) / (L * S))
+
+    def lms_percentile(L, M, S, z):
+        """Inverse WHO LMS kernel (NumPy array expression)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(L == 0, M * np.exp(S * z), M * (1.0 + L * S * z) ** (1.0 / L))
+
+# pygrowup switches to weekly WHO tables up to 13 weeks; leave that range to it
+_WEEKLY_TABLE_MAX_MONTHS = 13 * 7 / 30.4374
+
+def _table_z_score(value: float, age_months: float, gender: str, kind: str) -> Optional[float]:
+    """Z-score from the parsed monthly LMS rows, same row choice as pygrowup (floor month)"""
+    table = LMS.get(kind, {}).get(gender)
+    if table is None or value is None or not value > 0 or not math.isfinite(value):
+        return None
+    row = int(math.floor(age_months))
+    table_ages, L, M, S = table
+    if row < 0 or row >= len(table_ages):
+        return None
+    return _round2(_lms_zscore(value, float(L[row]), float(M[row]), float(S[row])))
+
 def calculate_z_score(weight: float, height: float, age_months: float, 
                      gender: str, measurement_type: str = 'wfa') -> Optional[float]:
-    """Calculate WHO z-score using pygrowup calculator"""
+    """Calculate WHO z-score (compiled LMS path for age-based indices, pygrowup otherwise)"""
     if calc is None:
         return None
     
+    # Age-based indices with monthly LMS rows: no Decimal arithmetic per request
+    if measurement_type in LMS and age_months is not None and age_months > _WEEKLY_TABLE_MAX_MONTHS:
+        value = height if measurement_type == 'hfa' else weight
+        return _table_z_score(value, age_months, gender, measurement_type)
+    
     try:
         if measurement_type == 'wfa':
             return calc.wfa(weight, age_months, gender)
         elif measurement_type == 'hfa':
-            return calc.hfa(height, age_months, gender)
+            return calc.lhfa(height, age_months, gender)  # pygrowup name for length/height-for-age
         elif measurement_type == 'wfh':
-            return calc.wfh(weight, height, gender)
+            return calc.wfh(weight, age_months, gender, height=height)  # table is indexed by height
         elif measurement_type == 'bfa':
-            return calc.bfa(weight, height, gender)  # BMI-for-age
+            bmi = weight / (height / 100.0) ** 2
+            return calc.bmifa(bmi, age_months, gender)  # pygrowup name for BMI-for-age
         elif measurement_type == 'hcfa':
             return calc.hcfa(weight, age_months, gender)  # Head circumference
         else:
@@ -623,23 +1038,246 @@ def calculate_z_score(weight: float, height: float, age_months: float,
         print(f"Error calculating z-score: {e}")
         return None
 
+@lru_cache(maxsize=65536)
+def calculate_z_score_cached(weight: Optional[float], height: Optional[float], age_months: float,
+                             gender: str, measurement_type: str = 'wfa') -> Optional[float]:
+    """Memoized calculate_z_score (clinic UIs resend the same 0.1 kg / 0.1 cm values)"""
+    return calculate_z_score(weight, height, age_months, gender, measurement_type)
+
+def _round2_array(z: np.ndarray) -> np.ndarray:
+    """Element-wise _round2 (half away from zero); NaN stays NaN"""
+    return np.where(z >= 0, np.floor(z * 100 + 0.5), -np.floor(-z * 100 + 0.5)) / 100.0
+
+def batch_z_scores(values, ages, gender: str, kind: str = 'wfa') -> Optional[np.ndarray]:
+    """Vectorized calculate_z_score for one gender: same floor-month row, rounding and pygrowup fallback"""
+    table = LMS.get(kind, {}).get(gender)
+    if table is None:
+        return None
+
+    table_ages, L_table, M_table, S_table = table
+    x = np.asarray(values, dtype=np.float64)
+    t = np.asarray(ages, dtype=np.float64)
+    z = np.full(x.shape, np.nan)
+
+    # Monthly rows (floor month, as pygrowup); NaN ages/values compare False and stay NaN
+    with np.errstate(invalid='ignore'):
+        monthly = (t > _WEEKLY_TABLE_MAX_MONTHS) & (t < len(table_ages)) & (x > 0)
+    rows = np.floor(t[monthly]).astype(np.intp)
+    z[monthly] = _round2_array(lms_z(x[monthly], L_table[rows], M_table[rows], S_table[rows]))
+
+    # Weekly-table range (<= 13 weeks) goes through pygrowup, exactly like the scalar path
+    for i in np.flatnonzero(t <= _WEEKLY_TABLE_MAX_MONTHS):
+        value = None if np.isnan(x[i]) else float(x[i])
+        zi = calculate_z_score(value, value, float(t[i]), gender, kind)
+        if zi is not None:
+            z[i] = float(zi)
+    return z
+
+def cohort_z_scores(values, ages, genders: List[str], kind: str = 'wfa') -> np.ndarray:
+    """batch_z_scores for a mixed-gender cohort (NaN where a child cannot be assessed)"""
+    x = np.asarray(values, dtype=np.float64)
+    t = np.asarray(ages, dtype=np.float64)
+    g = np.asarray(genders, dtype=object)
+    z = np.full(x.shape, np.nan)
+    for gender in _VALID_GENDERS:
+        mask = g == gender
+        if mask.any():
+            part = batch_z_scores(x[mask], t[mask], gender, kind)
+            if part is not None:
+                z[mask] = part
+    return z
+
+# WHO reference percentiles drawn on growth charts
+REFERENCE_PERCENTILES = (3, 15, 50, 85, 97)
+
+@lru_cache(maxsize=32)
+def _grid_lms(gender: str, kind: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """L, M, S interpolated onto AGE_GRID (float64), computed once per (gender, kind)"""
+    table = LMS.get(kind, {}).get(gender)
+    if table is None:
+        return None
+
+    table_ages, L_table, M_table, S_table = table
+    return tuple(np.interp(AGE_GRID, table_ages, col) for col in (L_table, M_table, S_table))
+
+@lru_cache(maxsize=128)
+def reference_curve(gender: str, kind: str, z: float) -> Optional[np.ndarray]:
+    """Read-only float32 WHO measurement values at z-score z over AGE_GRID (inverse LMS)"""
+    grid = _grid_lms(gender, kind)
+    if grid is None:
+        return None
+
+    curve = lms_percentile(*grid, z).astype(np.float32)
+    curve.setflags(write=False)
+    return curve
+
+@lru_cache(maxsize=32)
+def get_reference_curves(gender: str, kind: str) -> Optional[Tuple[np.ndarray, ...]]:
+    """Read-only float32 WHO curves over AGE_GRID, one per REFERENCE_PERCENTILES entry"""
+    if kind not in LMS or gender not in LMS[kind]:
+        return None
+
+    return tuple(reference_curve(gender, kind, float(ndtri(p / 100.0)))
+                 for p in REFERENCE_PERCENTILES)
+
+# Warm the curve cache for every available (gender, kind) combination
+for _kind in LMS:
+    for _gender in LMS_SEX_NAMES:
+        get_reference_curves(_gender, _kind)
+
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
+def z_to_percentile(z_arr) -> np.ndarray:
+    """Convert z-score(s) to percentile(s) of the standard normal distribution"""
+    return 0.5 * (1.0 + erf(np.asarray(z_arr, dtype=np.float64) * _INV_SQRT2)) * 100.0
+
+# Nutrition classification lookup tables (bucket i covers _THRESHOLDS[i-1] < z <= _THRESHOLDS[i]).
+# The -3/-2 cut-offs are exclusive (z < -3, z < -2), so they are shifted one ulp down.
+_THRESHOLDS = np.array([np.nextafter(-3.0, -np.inf), np.nextafter(-2.0, -np.inf), 1.0, 2.0, 3.0])
+_STATUS = np.array(["Gizi Buruk", "Gizi Kurang", "Gizi Baik", "Berisiko Gizi Lebih",
+                    "Gizi Lebih", "Obesitas", "Tidak dapat dinilai"])
+_COLOR = np.array(["#d32f2f", "#f57c00", "#388e3c", "#fbc02d", "#f57c00", "#d32f2f", "#9e9e9e"])
+_CATEGORY = np.array(["severe_underweight", "underweight", "normal", "risk_overweight",
+                      "overweight", "obese", "unknown"])
+_UNKNOWN_IDX = len(_STATUS) - 1
+
+def classify_nutrition_batch(z_arr) -> dict:
+    """Classify nutritional status for an array of z-scores (NaN = not assessable)"""
+    z = np.asarray(z_arr, dtype=np.float64)
+    idx = np.searchsorted(_THRESHOLDS, z, side='left')
+    idx = np.where(np.isnan(z), _UNKNOWN_IDX, idx)
+    return dict(status=_STATUS[idx], color=_COLOR[idx], category=_CATEGORY[idx],
+                percentile=z_to_percentile(z))
+
 def classify_nutrition(z_score: float) -> dict:
     """Classify nutritional status based on z-score"""
-    if z_score is None:
-        return {"status": "Tidak dapat dinilai", "color": "#9e9e9e", "category": "unknown"}
-    
-    if z_score < -3:
-        return {"status": "Gizi Buruk", "color": "#d32f2f", "category": "severe_underweight"}
-    elif z_score < -2:
-        return {"status": "Gizi Kurang", "color": "#f57c00", "category": "underweight"}
-    elif z_score <= 1:
-        return {"status": "Gizi Baik", "color": "#388e3c", "category": "normal"}
-    elif z_score <= 2:
-        return {"status": "Berisiko Gizi Lebih", "color": "#fbc02d", "category": "risk_overweight"}
-    elif z_score <= 3:
-        return {"status": "Gizi Lebih", "color": "#f57c00", "category": "overweight"}
-    else:
-        return {"status": "Obesitas", "color": "#d32f2f", "category": "obese"}
+    if z_score is None or math.isnan(z_score):
+        return {"status": "Tidak dapat dinilai", "color": "#9e9e9e", "category": "unknown",
+                "percentile": None}
+
+    batch = classify_nutrition_batch(np.array([float(z_score)]))
+    return {
+        "status": str(batch["status"][0]),
+        "color": str(batch["color"][0]),
+        "category": str(batch["category"][0]),
+        "percentile": round(float(batch["percentile"][0]), 1),
+    }
+
+# Column layout for child measurement reports (CSV/PDF export)
+REPORT_HEADER = ["nama", "usia_bulan", "jenis_kelamin", "berat_kg", "tinggi_cm",
+                 "waz", "haz", "status_gizi"]
+
+def _float_column(values: List[Optional[float]]) -> np.ndarray:
+    """Convert a list of optional numbers to a float64 column (None -> NaN)"""
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+
+def _report_columns(records: List[dict]) -> tuple:
+    """Parse child records column-wise: (names, ages, genders, weights, heights, waz, haz)"""
+    names = [record.get('name', '') for record in records]
+    ages = [as_float(record.get('age_months')) for record in records]
+    genders = [str(record.get('gender') or 'M').upper() for record in records]
+    weights = [as_float(record.get('weight')) for record in records]
+    heights = [as_float(record.get('height')) for record in records]
+
+    age_arr = _float_column(ages)
+    waz = cohort_z_scores(_float_column(weights), age_arr, genders, 'wfa')
+    haz = cohort_z_scores(_float_column(heights), age_arr, genders, 'hfa')
+    return names, ages, genders, weights, heights, waz, haz
+
+def iter_report_rows(records: List[dict]):
+    """Yield one report row (z-scores + classification) per child record"""
+    names, ages, genders, weights, heights, waz, haz = _report_columns(records)
+    statuses = classify_nutrition_batch(waz)["status"]
+    for i in range(len(records)):
+        yield [
+            names[i],
+            ages[i],
+            genders[i],
+            weights[i],
+            heights[i],
+            '' if np.isnan(waz[i]) else float(waz[i]),
+            '' if np.isnan(haz[i]) else float(haz[i]),
+            str(statuses[i]),
+        ]
+
+def build_report_frame(records: List[dict]) -> 'pd.DataFrame':
+    """Build the child measurement report column-wise as a DataFrame"""
+    import pandas as pd
+
+    names, ages, genders, weights, heights, waz, haz = _report_columns(records)
+    return pd.DataFrame({
+        "nama": names,
+        "usia_bulan": _float_column(ages),
+        "jenis_kelamin": genders,
+        "berat_kg": _float_column(weights),
+        "tinggi_cm": _float_column(heights),
+        "waz": waz,
+        "haz": haz,
+        "status_gizi": classify_nutrition_batch(waz)["status"],
+    }, columns=REPORT_HEADER)
+
+def stream_csv(rows_iter, header: List[str]):
+    """Stream CSV text row by row instead of building the whole file in memory"""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(header)
+    yield buf.getvalue()
+    for row in rows_iter:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerow(row)
+        yield buf.getvalue()
+
+def build_pdf_report(records: List[dict]) -> bytes:
+    """Build a PDF report of child measurements as a single ReportLab Table"""
+    from reportlab.lib import colors as rl_colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+    df = build_report_frame(records)
+    data = [REPORT_HEADER] + df.astype(object).where(df.notna(), '').astype(str).values.tolist()
+
+    table = Table(data, repeatRows=1, colWidths=[5*cm, 2.2*cm, 2.5*cm, 2.2*cm, 2.2*cm,
+                                                 1.8*cm, 1.8*cm, 4*cm])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#ff6b9d')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.white),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [rl_colors.white, rl_colors.HexColor('#fff5f8')]),
+        ('GRID', (0, 0), (-1, -1), 0.25, rl_colors.HexColor('#ffd4e0')),
+        ('ALIGN', (1, 1), (-2, -1), 'RIGHT'),
+    ]))
+
+    styles = getSampleStyleSheet()
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=landscape(A4), title=APP_TITLE,
+                            leftMargin=1.5*cm, rightMargin=1.5*cm, topMargin=1.5*cm, bottomMargin=1.5*cm)
+    doc.build([
+        Paragraph(f"Laporan Status Gizi - {APP_TITLE}", styles['Title']),
+        Paragraph(f"Dibuat: {date.today().isoformat()} | WHO Child Growth Standards 2006", styles['Normal']),
+        Spacer(1, 0.5*cm),
+        table,
+    ])
+    return buf.getvalue()
+
+# QR codes for fixed URLs are deterministic: render once as SVG, reuse the bytes
+QR_TARGETS = {
+    'app': BASE_URL,
+    'whatsapp': f"https://wa.me/{CONTACT_WA}",
+}
+_QR_CACHE: Dict[str, bytes] = {}
+
+def get_qr(url: str) -> bytes:
+    """Return cached SVG bytes of the QR code for a URL (rendered on first use)"""
+    svg = _QR_CACHE.get(url)
+    if svg is None:
+        import qrcode
+        from qrcode.image.svg import SvgPathImage
+        svg = _QR_CACHE.setdefault(url, qrcode.make(url, image_factory=SvgPathImage).to_string())
+    return svg
 
 # ===============================================================================
 # SECTION 6: FLASK ROUTES
@@ -659,7 +1297,8 @@ def dashboard():
     return render_template('dashboard.html',
                          app_title=APP_TITLE,
                          app_version=APP_VERSION,
-                         contact_wa=CONTACT_WA)
+                         contact_wa=CONTACT_WA,
+                         quote=next_quote())
 
 @app.route('/calculator')
 def calculator():
@@ -674,7 +1313,8 @@ def kpsp():
     return render_template('kpsp.html',
                          app_title=APP_TITLE,
                          app_version=APP_VERSION,
-                         kpsp_questions=KPSP_QUESTIONS)
+                         kpsp_questions=KPSP_QUESTIONS,
+                         kpsp_json=_KPSP_JSON)
 
 @app.route('/library')
 def library():
@@ -682,7 +1322,9 @@ def library():
     return render_template('library.html',
                          app_title=APP_TITLE,
                          app_version=APP_VERSION,
-                         articles=ARTIKEL_LOKAL_DATABASE)
+                         articles=ARTIKEL_LOKAL_DATABASE,
+                         articles_by_date=_ARTIKEL_BY_DATE,
+                         articles_by_category=_ARTIKEL_BY_CATEGORY)
 
 @app.route('/growth-tracker')
 def growth_tracker():
@@ -719,167 +1361,386 @@ def reports():
 # SECTION 7: API ENDPOINTS
 # ===============================================================================
 
+# API errors: JSON bodies, encoded once per distinct message
+_GENERIC_ERROR_BYTES = orjson.dumps({"error": "Internal server error"})
+_BAD_JSON_MESSAGE = "Request body must be a JSON object"
+
+@lru_cache(maxsize=256)
+def _error_body(message: str) -> bytes:
+    """Pre-encoded JSON error body for an error message"""
+    return orjson.dumps({"error": message})
+
+@app.errorhandler(HTTPException)
+def handle_http_error(e: HTTPException):
+    """abort()/routing errors: JSON for API routes, Werkzeug's default page elsewhere"""
+    if not request.path.startswith('/api/'):
+        return e
+    headers = [h for h in e.get_headers() if h[0].lower() != 'content-type']
+    return app.response_class(_error_body(e.description), status=e.code, headers=headers,
+                              mimetype='application/json')
+
+@app.errorhandler(Exception)
+def handle_unexpected_error(e: Exception):
+    """Unhandled errors: log the traceback, return a generic 500 without internals"""
+    print(f"❌ Unhandled error on {request.path}: {e}")
+    traceback.print_exc()
+    if not request.path.startswith('/api/'):
+        return InternalServerError(original_exception=e)
+    return app.response_class(_GENERIC_ERROR_BYTES, status=500, mimetype='application/json')
+
 @app.route('/api/calculate-zscore', methods=['POST'])
 def api_calculate_zscore():
     """API endpoint for z-score calculation"""
-    try:
-        data = request.get_json()
-        
-        weight = as_float(data.get('weight'))
-        height = as_float(data.get('height'))
-        age_months = as_float(data.get('age_months'))
-        gender = data.get('gender', 'M').upper()
-        measurement_type = data.get('type', 'wfa')
-        
-        # Validate inputs
-        if weight is None or age_months is None:
-            return jsonify({"error": "Weight and age are required"}), 400
-        
-        if gender not in ['M', 'F']:
-            return jsonify({"error": "Gender must be M or F"}), 400
-        
-        # Calculate z-score
-        z_score = calculate_z_score(weight, height, age_months, gender, measurement_type)
-        
-        if z_score is None:
-            return jsonify({"error": "Could not calculate z-score"}), 500
-        
-        # Classify nutrition
-        classification = classify_nutrition(z_score)
-        
-        return jsonify({
-            "z_score": round(z_score, 2),
-            "classification": classification,
-            "measurement_type": measurement_type,
-            "inputs": {
-                "weight": weight,
-                "height": height,
-                "age_months": age_months,
-                "gender": gender
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict):
+        abort(400, description=_BAD_JSON_MESSAGE)
+    
+    weight = _num(data.get('weight'))
+    height = _num(data.get('height'))
+    age_months = _num(data.get('age_months'))
+    gender = str(data.get('gender') or 'M').upper()
+    measurement_type = str(data.get('type') or 'wfa')
+    
+    # Validate inputs
+    if weight is None or age_months is None:
+        abort(400, description="Weight and age are required")
+    
+    # as_float accepts "inf"/"nan"/"1e999"; no measurement or age is ever non-finite
+    if not all(math.isfinite(v) for v in (weight, height, age_months) if v is not None):
+        abort(400, description="Weight, height and age must be finite numbers")
+    
+    if gender not in _VALID_GENDERS:
+        abort(400, description="Gender must be M or F")
+    
+    if measurement_type not in _VALID_TYPES:
+        abort(400, description="Type must be one of wfa, hfa, wfh, bfa, hcfa")
+    
+    # Calculate z-score (drop the input this index ignores so it doesn't split the cache key)
+    z_score = calculate_z_score_cached(weight if measurement_type in _USES_WEIGHT else None,
+                                       height if measurement_type in _USES_HEIGHT else None,
+                                       age_months, gender, measurement_type)
+    
+    if z_score is None:
+        abort(500, description="Could not calculate z-score")
+    
+    # Classify nutrition
+    classification = classify_nutrition(z_score)
+    
+    payload = {
+        "z_score": _round2(z_score),
+        "classification": classification,
+        "measurement_type": measurement_type
+    }
+    # Clients already have what they sent; echo the parsed inputs only on request
+    if request.args.get('echo') == '1':
+        payload["inputs"] = {
+            "weight": weight,
+            "height": height,
+            "age_months": age_months,
+            "gender": gender
+        }
+    
+    return ojsonify(payload)
 
 @app.route('/api/kpsp-evaluate', methods=['POST'])
 def api_kpsp_evaluate():
     """API endpoint for KPSP evaluation"""
-    try:
-        data = request.get_json()
-        age_months = as_float(data.get('age_months'))
-        answers = data.get('answers', [])
-        
-        if age_months is None:
-            return jsonify({"error": "Age is required"}), 400
-        
-        # Find appropriate age group
-        age_group = None
-        for age in sorted(KPSP_QUESTIONS.keys()):
-            if age_months >= age:
-                age_group = age
-        
-        if age_group is None:
-            return jsonify({"error": "No KPSP questions available for this age"}), 400
-        
-        questions = KPSP_QUESTIONS[age_group]
-        
-        if len(answers) != len(questions):
-            return jsonify({"error": "Number of answers doesn't match questions"}), 400
-        
-        # Calculate score
-        score = sum(1 for answer in answers if answer)
-        
-        # Determine result
-        if score >= len(questions) * 0.8:
-            result = "Perkembangan Sesuai Usia"
-            color = "#4caf50"
-            recommendation = "Pertumbuhan dan perkembangan anak sesuai usia. Terus lakukan stimulasi."
-        elif score >= len(questions) * 0.6:
-            result = "Perkembangan Terduga Terlambat"
-            color = "#ff9800"
-            recommendation = "Perlu stimulasi intensif dan pemantauan lebih lanjut."
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict):
+        abort(400, description=_BAD_JSON_MESSAGE)
+    age_months = _num(data.get('age_months'))
+    answers = data.get('answers', [])
+    
+    if age_months is None:
+        abort(400, description="Age is required")
+    if not isinstance(answers, list):
+        abort(400, description="answers must be a list")
+    
+    # Find appropriate age group (largest group <= age)
+    idx = bisect.bisect_right(_KPSP_AGES, age_months) - 1
+    if idx < 0 or math.isnan(age_months):
+        abort(400, description="No KPSP questions available for this age")
+    
+    age_group = _KPSP_AGES[idx]
+    questions = KPSP_QUESTIONS[age_group]
+    
+    if len(answers) != len(questions):
+        abort(400, description="Number of answers doesn't match questions")
+    
+    # Calculate score (C-level truth count)
+    n_questions = len(questions)
+    score = sum(map(bool, answers))
+    
+    # Determine result (first verdict whose threshold the score reaches)
+    for fraction, result, color, recommendation in _KPSP_VERDICTS:
+        if score >= n_questions * fraction:
+            break
+    
+    payload = {
+        "age_group": age_group,
+        "score": score,
+        "total_questions": n_questions,
+        "result": result,
+        "color": color,
+        "recommendation": recommendation,
+        "answers": answers
+    }
+    # Question text is static per age group (GET /api/kpsp-questions/<age>); echo only on request
+    if request.args.get('include_questions') == '1':
+        payload["questions"] = questions
+    
+    return ojsonify(payload)
+
+@app.route('/api/kpsp-evaluate-batch', methods=['POST'])
+def api_kpsp_evaluate_batch():
+    """API endpoint for evaluating many KPSP screenings at once (one result per child)"""
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict):
+        abort(400, description=_BAD_JSON_MESSAGE)
+    
+    ages_in = data.get('age_months')
+    answers = data.get('answers')
+    if not isinstance(ages_in, list) or not isinstance(answers, list) or not ages_in:
+        abort(400, description="age_months and answers must be non-empty lists")
+    if len(ages_in) != len(answers):
+        abort(400, description="age_months and answers must have the same length")
+    if len(ages_in) > KPSP_BATCH_MAX:
+        abort(400, description=f"At most {KPSP_BATCH_MAX} screenings per batch")
+    if not all(isinstance(row, list) for row in answers):
+        abort(400, description="Each answers entry must be a list")
+    
+    # Age group per child (largest group <= age), vectorised
+    parsed = [as_float(a) for a in ages_in]
+    missing_age = np.fromiter((a is None for a in parsed), dtype=np.bool_, count=len(parsed))
+    ages = np.array(parsed, dtype=np.float64)
+    idx = np.searchsorted(_KPSP_AGES_ARR, ages, side='right') - 1
+    no_group = (idx < 0) | np.isnan(ages)
+    idx = np.where(no_group, 0, idx)
+    
+    # Scores: flatten answers once, then sum each child's slice (same truthiness as sum(map(bool, ...)))
+    lengths = np.fromiter(map(len, answers), dtype=np.int64, count=len(answers))
+    flat = np.fromiter(map(bool, itertools.chain.from_iterable(answers)), dtype=np.bool_,
+                       count=int(lengths.sum()))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    scores = np.zeros(len(answers), dtype=np.int64)
+    nonempty = lengths > 0
+    if flat.size:
+        scores[nonempty] = np.add.reduceat(flat.astype(np.int64), starts[nonempty])
+    
+    counts = _KPSP_COUNTS[idx]
+    mismatched = ~no_group & (lengths != counts)
+    
+    # First verdict whose threshold the score reaches (the last one is always reached)
+    reached = scores[:, None] >= counts[:, None] * _KPSP_FRACTIONS[None, :]
+    verdict = reached.argmax(axis=1)
+    
+    results = []
+    for i in range(len(answers)):
+        if missing_age[i]:
+            results.append({"error": "Age is required"})
+        elif no_group[i]:
+            results.append({"error": "No KPSP questions available for this age"})
+        elif mismatched[i]:
+            results.append({"error": "Number of answers doesn't match questions"})
         else:
-            result = "Perkembangan Terlambat"
-            color = "#f44336"
-            recommendation = "Segera konsultasikan dengan dokter anak untuk evaluasi lebih lanjut."
-        
-        return jsonify({
-            "age_group": age_group,
-            "score": score,
-            "total_questions": len(questions),
-            "result": result,
-            "color": color,
-            "recommendation": recommendation,
-            "questions": questions,
-            "answers": answers
-        })
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+            _, result, color, recommendation = _KPSP_VERDICTS[verdict[i]]
+            results.append({
+                "age_group": _KPSP_AGES[idx[i]],
+                "score": int(scores[i]),
+                "total_questions": int(counts[i]),
+                "result": result,
+                "color": color,
+                "recommendation": recommendation
+            })
+    return ojsonify(results)
+
+def _export_records() -> List[dict]:
+    """Parse and validate the {"records": [...]} body shared by the export endpoints"""
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict):
+        abort(400, description=_BAD_JSON_MESSAGE)
+    records = data.get('records')
+    if not isinstance(records, list) or not records:
+        abort(400, description="Records are required")
+    if not all(isinstance(r, dict) for r in records):
+        abort(400, description="Each record must be a JSON object")
+    return records
+
+@app.route('/api/export-csv', methods=['POST'])
+def api_export_csv():
+    """API endpoint for streaming CSV export of child measurements"""
+    records = _export_records()
+    invalid = invalid_record_rows(records)
+    if invalid:
+        return ojsonify({"error": "Measurements outside WHO bounds", "invalid_rows": invalid}, 400)
+
+    filename = f"peduligizi_report_{date.today().isoformat()}.csv"
+    return Response(
+        stream_with_context(stream_csv(iter_report_rows(records), REPORT_HEADER)),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+@app.route('/api/export-pdf', methods=['POST'])
+def api_export_pdf():
+    """API endpoint for PDF report export of child measurements"""
+    records = _export_records()
+    invalid = invalid_record_rows(records)
+    if invalid:
+        return ojsonify({"error": "Measurements outside WHO bounds", "invalid_rows": invalid}, 400)
+
+    filename = f"peduligizi_report_{date.today().isoformat()}.pdf"
+    return send_file(io.BytesIO(build_pdf_report(records)), mimetype='application/pdf',
+                     as_attachment=True, download_name=filename)
+
+@app.route('/api/growth-curve', methods=['GET'])
+def api_growth_curve():
+    """API endpoint for WHO reference percentile curves (rendered client-side)"""
+    gender = request.args.get('gender', 'M').upper()
+    kind = request.args.get('kind', 'wfa')
+
+    if gender not in _VALID_GENDERS:
+        return ojsonify({"error": "Gender must be M or F"}, 400)
+    if kind not in LMS:
+        # Checked before the lru_cache so junk kinds cannot evict the warmed curves
+        return ojsonify({"error": f"Reference curves not available for '{kind}'"}, 400)
+
+    curves = get_reference_curves(gender, kind)
+    if curves is None:
+        return ojsonify({"error": f"Reference curves not available for '{kind}'"}, 400)
+
+    # Curves depend only on (gender, kind, version): let clients revalidate cheaply
+    etag = hashlib.blake2b(f"{gender}|{kind}|{APP_VERSION}".encode(), digest_size=8).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        resp = app.response_class(status=304)
+        resp.set_etag(etag)
+        return resp
+
+    payload = {
+        "gender": gender,
+        "kind": kind,
+        "ages": AGE_GRID.tolist(),
+    }
+    for p, curve in zip(REFERENCE_PERCENTILES, curves):
+        payload[f"p{p}"] = np.round(curve.astype(np.float64), 2).tolist()
+
+    resp = ojsonify(payload)
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = 'public, max-age=86400'
+    return resp
+
+@app.route('/api/qr/<target>')
+def api_qr(target):
+    """API endpoint for QR codes (app link, WhatsApp contact) as SVG"""
+    url = QR_TARGETS.get(target)
+    if url is None:
+        return ojsonify({"error": f"Unknown QR target '{target}'"}, 404)
+
+    return send_file(io.BytesIO(get_qr(url)), mimetype='image/svg+xml', max_age=86400)
+
+# Static API payloads: computed and serialized once at import
+_GROWTH_SAMPLE_DATA = {
+    "labels": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
+    "weight": [3.2, 3.8, 4.5, 5.1, 5.8, 6.4],
+    "height": [50, 52, 55, 58, 61, 64],
+    "z_scores": [-0.5, -0.3, 0.1, 0.4, 0.7, 0.9]
+}
+
+_INFO_DATA = {
+    "app_name": APP_TITLE,
+    "version": APP_VERSION,
+    "description": APP_DESCRIPTION,
+    "author": "Habib Arsy - FKIK Universitas Jambi",
+    "contact": f"+{CONTACT_WA}",
+    "base_url": BASE_URL,
+    "standards": {
+        "who": "Child Growth Standards 2006",
+        "permenkes": "No. 2 Tahun 2020"
+    },
+    "supported_indices": ["WAZ", "HAZ", "WHZ", "BAZ", "HCZ"],
+    "age_range": "0-60 months",
+    "features": [
+        "WHO z-score calculation",
+        "Permenkes 2020 classification",
+        "Growth charts visualization",
+        "PDF report export",
+        "CSV data export",
+        "KPSP screening",
+        "Monthly checklist recommendations",
+        "YouTube Video Integration",
+        "Mode Mudah",
+        "Kalkulator Kejar Tumbuh",
+        "Perpustakaan Artikel Interaktif",
+        "Flask Web Interface"
+    ]
+}
+
+_GROWTH_BYTES = orjson.dumps(_GROWTH_SAMPLE_DATA)
+_GROWTH_ETAG = hashlib.sha1(_GROWTH_BYTES).hexdigest()
+_INFO_BYTES = orjson.dumps(_INFO_DATA)
+_INFO_ETAG = hashlib.sha1(_INFO_BYTES).hexdigest()
+
+# One pre-serialized body + ETag per KPSP age group
+_KPSP_QUESTIONS_BYTES = {}
+for _age, _questions in KPSP_QUESTIONS.items():
+    _body = orjson.dumps({"age_group": _age, "questions": _questions})
+    _KPSP_QUESTIONS_BYTES[_age] = (_body, hashlib.sha1(_body).hexdigest())
+
+def static_json_response(body: bytes, etag: str, max_age: int = 3600) -> Response:
+    """Serve precomputed JSON bytes with ETag/Cache-Control (304 when the client copy is current)"""
+    if request.if_none_match.contains_weak(etag):
+        resp = app.response_class(status=304)
+    else:
+        resp = app.response_class(body, mimetype='application/json')
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return resp
 
 @app.route('/api/growth-data', methods=['GET'])
 def api_growth_data():
     """API endpoint to get sample growth data"""
-    # Generate sample data for demonstration
-    sample_data = {
-        "labels": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
-        "weight": [3.2, 3.8, 4.5, 5.1, 5.8, 6.4],
-        "height": [50, 52, 55, 58, 61, 64],
-        "z_scores": [-0.5, -0.3, 0.1, 0.4, 0.7, 0.9]
-    }
-    return jsonify(sample_data)
+    return static_json_response(_GROWTH_BYTES, _GROWTH_ETAG)
 
 @app.route('/api/info')
 def api_info():
     """API information endpoint"""
-    return jsonify({
-        "app_name": APP_TITLE,
-        "version": APP_VERSION,
-        "description": APP_DESCRIPTION,
-        "author": "Habib Arsy - FKIK Universitas Jambi",
-        "contact": f"+{CONTACT_WA}",
-        "base_url": BASE_URL,
-        "standards": {
-            "who": "Child Growth Standards 2006",
-            "permenkes": "No. 2 Tahun 2020"
-        },
-        "supported_indices": ["WAZ", "HAZ", "WHZ", "BAZ", "HCZ"],
-        "age_range": "0-60 months",
-        "features": [
-            "WHO z-score calculation",
-            "Permenkes 2020 classification",
-            "Growth charts visualization",
-            "PDF report export",
-            "CSV data export",
-            "KPSP screening",
-            "Monthly checklist recommendations",
-            "YouTube Video Integration",
-            "Mode Mudah",
-            "Kalkulator Kejar Tumbuh",
-            "Perpustakaan Artikel Interaktif",
-            "Flask Web Interface"
-        ]
-    })
+    return static_json_response(_INFO_BYTES, _INFO_ETAG)
+
+@app.route('/api/kpsp-questions/<int:age_group>')
+def api_kpsp_questions(age_group):
+    """API endpoint for the KPSP question set of one age group"""
+    cached = _KPSP_QUESTIONS_BYTES.get(age_group)
+    if cached is None:
+        return ojsonify({"error": f"No KPSP questions for age group {age_group}"}, 404)
+    return static_json_response(*cached)
+
+def warm_up() -> None:
+    """Run the request hot paths once at import so the first real request pays no warm-up cost"""
+    try:
+        for kind, value in (('wfa', 7.5), ('hfa', 67.0), ('hcfa', 43.0)):
+            classify_nutrition(calculate_z_score(value, value, 6.0, 'M', kind))
+        batch_z_scores(np.full(len(AGE_GRID), 10.0), AGE_GRID, 'F', 'wfa')
+        np.add.reduceat(np.ones(10, dtype=np.int64), np.array([0, 5]))
+        _error_body(_BAD_JSON_MESSAGE)  # a message the API really sends, so the cached body is reused
+        print("✅ Request hot paths warmed up")
+    except Exception as e:
+        print(f"⚠️  WARNING: Warm-up skipped: {e}")
+
+# With `gunicorn --preload` this runs once in the master, before workers fork
+warm_up()
+
+# Everything built above (calculator, LMS tables, caches, config) is long-lived.
+# Move it to the permanent GC generation so the collector never touches those
+# objects again: with `gunicorn --preload` the pages stay shared copy-on-write
+# between forked workers instead of being dirtied by GC bookkeeping.
+gc.freeze()
+print(f"✅ Startup objects frozen for GC ({gc.get_freeze_count()} objects)")
 
 # ===============================================================================
 # SECTION 8: MAIN APPLICATION STARTUP
 # ===============================================================================
 
 if __name__ == '__main__':
-    print("=" * 80)
-    print(f"🚀 {APP_TITLE} v{APP_VERSION} - FLASK EDITION")
-    print("=" * 80)
-    print(f"📊 WHO Calculator: {'✅ Operational' if calc else '❌ Unavailable'}")
-    print(f"🌐 Base URL: {BASE_URL}")
-    print(f"📱 Contact: +{CONTACT_WA}")
-    print(f"🎨 Themes: {len(UI_THEMES)} available")
-    print(f"💉 Immunization: {len(IMMUNIZATION_SCHEDULE)} schedules")
-    print(f"🧠 KPSP: {len(KPSP_QUESTIONS)} question sets")
-    print(f"📚 Perpustakaan: {len(ARTIKEL_LOKAL_DATABASE)} verified articles")
-    print(f"🎥 Videos: {len(KPSP_YOUTUBE_VIDEOS) + sum(len(v) for v in MPASI_YOUTUBE_VIDEOS.values())} video links")
-    print("=" * 80)
-    
-    # Run the Flask application
-    port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
+    # Importing this module already ran the full startup (tables, JIT, warm-up, gc.freeze);
+    # gunicorn --preload would repeat all of it, so start through server.py instead
+    print("ℹ️  Start the server with: python server.py (gunicorn, app preloaded once)")
@@ -5,37 +5,61 @@ Server untuk menjalankan aplikasi PeduliGiziBalita v3.3 - Flask Edition
 
 import os
 import sys
-import subprocess
+import shutil
+
+# Each worker holds its own copy of pandas/numba state; 2 fits a 512 MB Render instance.
+# The cap also covers cgroup CPU quotas, which neither cpu_count() nor affinity reflect.
+MAX_DEFAULT_WORKERS = 2
+
+def default_workers() -> int:
+    """CPUs this process may actually run on (affinity-aware), capped for small instances"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        cpus = os.cpu_count() or 1
+    return max(1, min(cpus, MAX_DEFAULT_WORKERS))
+
+def gunicorn_argv(port: int) -> list:
+    """Build the production gunicorn command line (pre-forked gthread workers)"""
+    workers = int(os.environ.get('WEB_CONCURRENCY') or default_workers())
+    threads = int(os.environ.get('GUNICORN_THREADS', 4))
+    return [
+        'gunicorn', 'app:app',
+        '--preload',                      # Import + warm app once; workers share it copy-on-write
+        '--workers', str(workers),
+        '--worker-class', 'gthread',
+        '--threads', str(threads),
+        '--bind', f'0.0.0.0:{port}',
+        '--access-logfile', '-',
+    ]
 
 def run_flask_app():
     """Run Flask application with proper configuration"""
-    
+
     # Set environment variables
     os.environ['FLASK_ENV'] = 'production'
     os.environ['FLASK_DEBUG'] = 'False'
     os.environ['SECRET_KEY'] = 'peduligizi-balita-secret-key-2024'
-    
+
     # Get port from environment or use default
     port = int(os.environ.get('PORT', 5000))
-    
-    # Run Flask application
-    try:
-        from app import app
-        print(f"🚀 Starting PeduliGiziBalita v3.3 on port {port}")
-        print(f"📱 Access the application at: http://localhost:{port}")
-        print("=" * 60)
-        
-        app.run(
-            host='0.0.0.0',
-            port=port,
-            debug=False,
-            threaded=True
-        )
-        
-    except ImportError:
-        print("❌ Error: Could not import Flask app")
-        print("Make sure app.py is in the same directory")
+
+    # Hand the process over to gunicorn (replaces this interpreter)
+    if shutil.which('gunicorn') is None:
+        print("❌ Error: gunicorn is not installed")
+        print("Install dependencies with: pip install -r requirements.txt")
         sys.exit(1)
+
+    argv = gunicorn_argv(port)
+    print(f"🚀 Starting PeduliGiziBalita v3.3 on port {port}")
+    print(f"📱 Access the application at: http://localhost:{port}")
+    print(f"⚙️  {' '.join(argv)}")
+    print("=" * 60)
+    sys.stdout.flush()
+
+    try:
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+        os.execvp(argv[0], argv)
     except Exception as e:
         print(f"❌ Error starting server: {e}")
         sys.exit(1)
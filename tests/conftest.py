@@ -0,0 +1,20 @@
+"""Shared fixtures: import the app once (skipped when pygrowup is not installed)."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def appmod():
+    pytest.importorskip("pygrowup")
+    import app
+    return app
+
+
+@pytest.fixture()
+def client(appmod):
+    return appmod.app.test_client()
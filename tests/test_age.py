@@ -0,0 +1,33 @@
+"""Age arithmetic: get_ages_in_months must agree with the scalar timedelta.days path."""
+
+import random
+from datetime import date, datetime, timedelta
+
+
+def test_datetimes_use_whole_elapsed_days(appmod):
+    birth, measured = datetime(2024, 1, 1, 23, 0), datetime(2024, 7, 1, 1, 0)
+    expected = (measured - birth).days / 30.4375
+    assert appmod.get_age_in_months(birth, measured) == expected
+    assert appmod.get_ages_in_months([birth], [measured])[0] == expected
+
+
+def test_vector_matches_scalar(appmod):
+    rng = random.Random("ages")
+    births, measured = [], []
+    for _ in range(500):
+        b = datetime(2019, 1, 1) + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))
+        births.append(b)
+        measured.append(b + timedelta(minutes=rng.randrange(-60 * 24, 5 * 365 * 24 * 60)))
+    births += [date(2023, 3, 31)]
+    measured += [date(2024, 2, 29)]
+    ages = appmod.get_ages_in_months(births, measured)
+    for b, m, age in zip(births, measured, ages):
+        assert age == appmod.get_age_in_months(b, m), (b, m)
+
+
+def test_missing_dates_are_nan(appmod):
+    import numpy as np
+    ages = appmod.get_ages_in_months([None, date(2024, 1, 1), np.datetime64("NaT")],
+                                     [date(2024, 5, 1), None, date(2024, 5, 1)])
+    assert np.isnan(ages).all()
+    assert np.isnan(appmod.batch_z_scores([8.0], ages[:1], "M", "wfa")[0])
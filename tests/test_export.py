@@ -0,0 +1,68 @@
+"""CSV/PDF report export endpoints."""
+
+import csv
+import io
+
+import pytest
+
+RECORDS = [
+    {"name": "a", "age_months": 10.5, "gender": "M", "weight": 8.5, "height": 70},
+    {"name": "b", "age_months": 24, "gender": "F", "weight": 11.0},
+]
+
+
+@pytest.mark.parametrize("url", ["/api/export-csv", "/api/export-pdf"])
+@pytest.mark.parametrize("kwargs, message", [
+    ({"data": "not json", "content_type": "application/json"}, "Request body must be a JSON object"),
+    ({"json": [RECORDS]}, "Request body must be a JSON object"),
+    ({"json": {"records": []}}, "Records are required"),
+    ({"json": {"records": {"name": "a"}}}, "Records are required"),
+    ({"json": {"records": [RECORDS[0], 5]}}, "Each record must be a JSON object"),
+    ({"json": {"records": [None]}}, "Each record must be a JSON object"),
+])
+def test_export_rejects_bad_bodies(client, url, kwargs, message):
+    r = client.post(url, **kwargs)
+    assert r.status_code == 400
+    assert r.get_json() == {"error": message}
+
+
+@pytest.mark.parametrize("url", ["/api/export-csv", "/api/export-pdf"])
+def test_export_reports_out_of_bounds_rows(client, url):
+    r = client.post(url, json={"records": [RECORDS[0], {"weight": 900}]})
+    assert r.status_code == 400
+    assert r.get_json()["invalid_rows"] == [1]
+
+
+@pytest.mark.parametrize("bad", [
+    {"weight": "nan"},
+    {"weight": "inf"},
+    {"height": "NaN"},
+    {"weight": "x"},
+    {"age_months": "inf"},
+    {"gender": "X"},
+    {"gender": 5},
+])
+def test_export_rejects_non_finite_values_and_unknown_gender(client, bad):
+    r = client.post("/api/export-csv", json={"records": [RECORDS[0], dict(RECORDS[1], **bad)]})
+    assert r.status_code == 400
+    assert r.get_json()["invalid_rows"] == [1]
+
+
+def test_export_csv_rows(client, appmod):
+    r = client.post("/api/export-csv", json={"records": RECORDS})
+    assert r.status_code == 200
+    assert r.mimetype == "text/csv"
+    rows = list(csv.reader(io.StringIO(r.get_data(as_text=True))))
+    assert rows[0] == appmod.REPORT_HEADER
+    assert rows[1][:6] == ["a", "10.5", "M", "8.5", "70.0", "-0.69"]
+    assert rows[2][6] == ""
+    assert len(rows) == 3
+
+
+def test_export_pdf(client):
+    pytest.importorskip("reportlab")
+    pytest.importorskip("pandas")
+    r = client.post("/api/export-pdf", json={"records": RECORDS})
+    assert r.status_code == 200
+    assert r.mimetype == "application/pdf"
+    assert r.data.startswith(b"%PDF")
@@ -0,0 +1,19 @@
+"""WHO reference curve endpoint (/api/growth-curve)."""
+
+
+def test_unknown_kind_is_rejected_before_cache(client, appmod):
+    before = appmod.get_reference_curves.cache_info()
+    for i in range(40):
+        r = client.get(f"/api/growth-curve?gender=M&kind=junk{i}")
+        assert r.status_code == 400
+    after = appmod.get_reference_curves.cache_info()
+    assert (after.misses, after.currsize) == (before.misses, before.currsize)
+
+
+def test_warmed_curve_is_served_from_cache(client, appmod):
+    before = appmod.get_reference_curves.cache_info()
+    r = client.get("/api/growth-curve?gender=F&kind=hfa")
+    assert r.status_code == 200
+    after = appmod.get_reference_curves.cache_info()
+    assert after.misses == before.misses
+    assert after.hits == before.hits + 1
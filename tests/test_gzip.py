@@ -0,0 +1,115 @@
+"""GzipMiddleware: negotiation, HEAD, and ETag handling on 200/304."""
+
+import gzip
+
+import pytest
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", True),
+    ("gzip, deflate, br", True),
+    ("GZIP; Q=0.5", True),
+    ("*", True),
+    ("gzip;q=0.001", True),
+    ("", False),
+    ("br, deflate", False),
+    ("x-gzip", False),
+    ("identity;q=1, gzip;q=0", False),
+    ("*;q=0.5, gzip;q=0", False),
+    ("*;q=0", False),
+])
+def test_accepts_gzip(appmod, header, expected):
+    assert appmod.GzipMiddleware.accepts_gzip(header) is expected
+
+
+def test_large_json_is_compressed(client):
+    plain = client.get("/api/info")
+    r = client.get("/api/info", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["Vary"]
+    assert int(r.headers["Content-Length"]) == len(r.data)
+    assert gzip.decompress(r.data) == plain.data
+    assert r.headers["ETag"] == "W/" + plain.headers["ETag"]
+
+
+def test_gzip_refused_with_q0(client):
+    r = client.get("/api/info", headers={"Accept-Encoding": "identity;q=1, gzip;q=0"})
+    assert "Content-Encoding" not in r.headers
+
+
+def test_head_passes_through(client):
+    get = client.get("/api/info")
+    r = client.head("/api/info", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in r.headers
+    assert r.headers["Content-Length"] == get.headers["Content-Length"]
+    assert r.headers["ETag"] == get.headers["ETag"]
+
+
+def test_small_response_keeps_strong_etag_on_304(client):
+    r = client.get("/api/growth-data", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in r.headers
+    etag = r.headers["ETag"]
+    assert not etag.startswith("W/")
+    r2 = client.get("/api/growth-data", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.headers["ETag"] == etag
+
+
+def test_compressed_response_304_matches_weak_etag(client):
+    r = client.get("/api/info", headers={"Accept-Encoding": "gzip"})
+    etag = r.headers["ETag"]
+    assert etag.startswith("W/")
+    r2 = client.get("/api/info", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.data == b""
+    assert r2.headers["ETag"] == etag
+
+
+def test_streamed_csv_not_compressed(client):
+    records = [{"name": "a", "weight": 10, "age_months": 12}] * 50
+    r = client.post("/api/export-csv", json={"records": records}, headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert "Content-Encoding" not in r.headers
+
+
+@pytest.mark.parametrize("headers", [{}, {"Accept-Encoding": "gzip"}])
+@pytest.mark.parametrize("method", ["get", "head"])
+def test_identity_responses_vary_on_accept_encoding(client, headers, method):
+    # /api/growth-data is below min_size: never gzipped, but still a compressible type
+    r = getattr(client, method)("/api/growth-data", headers=headers)
+    assert "Content-Encoding" not in r.headers
+    assert "Accept-Encoding" in r.headers["Vary"]
+    r = getattr(client, method)("/api/info", headers={"Accept-Encoding": "identity"})
+    assert "Accept-Encoding" in r.headers["Vary"]
+
+
+@pytest.mark.parametrize("headers", [{}, {"Accept-Encoding": "gzip"}])
+def test_304_varies_on_accept_encoding(client, headers):
+    etag = client.get("/api/growth-data").headers["ETag"]
+    r = client.get("/api/growth-data", headers=dict(headers, **{"If-None-Match": etag}))
+    assert r.status_code == 304
+    assert "Accept-Encoding" in r.headers["Vary"]
+
+
+def test_vary_is_merged_once(appmod):
+    headers = appmod.GzipMiddleware._with_vary([("Vary", "Origin"), ("Content-Type", "text/html")])
+    assert [v for k, v in headers if k == "Vary"] == ["Origin, Accept-Encoding"]
+    headers = appmod.GzipMiddleware._with_vary(headers)
+    assert [v for k, v in headers if k == "Vary"] == ["Origin, Accept-Encoding"]
+
+
+def test_no_transform_is_not_compressed(appmod):
+    body = b"x" * 4096
+
+    def wsgi_app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "application/json"),
+                                  ("Content-Length", str(len(body))),
+                                  ("Cache-Control", "public, no-transform")])
+        return [body]
+
+    seen = {}
+    out = appmod.GzipMiddleware(wsgi_app)({"REQUEST_METHOD": "GET", "HTTP_ACCEPT_ENCODING": "gzip"},
+                                           lambda status, headers, exc_info=None: seen.update(headers))
+    assert b"".join(out) == body
+    assert "Content-Encoding" not in seen
+    assert "Vary" not in seen
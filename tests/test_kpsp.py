@@ -0,0 +1,44 @@
+"""KPSP screening endpoints (/api/kpsp-evaluate and /api/kpsp-evaluate-batch)."""
+
+import random
+
+import pytest
+
+
+@pytest.mark.parametrize("answers", [None, 5, "yyyyyyyyyy", {"0": True}])
+def test_evaluate_rejects_non_list_answers(client, answers):
+    r = client.post("/api/kpsp-evaluate", json={"age_months": 12, "answers": answers})
+    assert r.status_code == 400
+    assert r.get_json()["error"] == "answers must be a list"
+
+
+def test_evaluate_scores_answers(client, appmod):
+    n = len(appmod.KPSP_QUESTIONS[12])
+    r = client.post("/api/kpsp-evaluate", json={"age_months": 12, "answers": [True] * n})
+    assert r.status_code == 200
+    body = r.get_json()
+    assert (body["age_group"], body["score"], body["total_questions"]) == (12, n, n)
+
+
+def test_batch_matches_single_endpoint(client, appmod):
+    rng = random.Random("kpsp-batch")
+    ages, answers = [], []
+    for _ in range(400):
+        ages.append(rng.choice([None, rng.randint(-3, 80), round(rng.uniform(0, 80), 1)]))
+        expected = len(appmod.KPSP_QUESTIONS[rng.choice(appmod._KPSP_AGES)])
+        n = rng.choice([expected, expected, 10, 9, 0, expected + 1])
+        answers.append([rng.choice([True, False, 1, 0, "ya", ""]) for _ in range(n)])
+
+    r = client.post("/api/kpsp-evaluate-batch", json={"age_months": ages, "answers": answers})
+    assert r.status_code == 200
+    batch = r.get_json()
+    assert len(batch) == len(ages)
+
+    for age, row, result in zip(ages, answers, batch):
+        single = client.post("/api/kpsp-evaluate", json={"age_months": age, "answers": row})
+        body = single.get_json()
+        if single.status_code == 200:
+            body.pop("answers")
+        else:
+            assert single.status_code == 400
+        assert result == body, (age, row)
@@ -0,0 +1,169 @@
+"""Compiled LMS z-scores (calculate_z_score fast path) against pygrowup's Decimal math."""
+
+import random
+
+import pytest
+
+# (fast-path kind, pygrowup indicator, measurement range)
+KINDS = [
+    ("wfa", "wfa", (2.0, 28.0)),
+    ("hfa", "lhfa", (45.0, 120.0)),
+    ("hcfa", "hcfa", (32.0, 54.0)),
+]
+
+
+def _reference(appmod, indicator, value, age, gender):
+    z = getattr(appmod.calc, indicator)(value, age, gender)
+    return None if z is None else float(z)
+
+
+def _fast(appmod, kind, value, age, gender):
+    # hcfa reads its measurement from the weight argument, hfa from height
+    return appmod.calculate_z_score(value, value, age, gender, kind)
+
+
+@pytest.mark.parametrize("kind, indicator, bounds", KINDS)
+def test_fast_path_matches_pygrowup(appmod, kind, indicator, bounds):
+    rng = random.Random(f"zscore-{kind}")
+    low, high = bounds
+    for _ in range(3000):
+        gender = rng.choice("MF")
+        age = round(rng.uniform(3.0, 60.9), 1)
+        value = round(rng.uniform(low, high), 1)
+        assert _fast(appmod, kind, value, age, gender) == _reference(appmod, indicator, value, age, gender), \
+            (kind, gender, age, value)
+
+
+@pytest.mark.parametrize("kind, indicator, gender, age, value", [
+    ("hfa", "lhfa", "F", 17, 74.5),
+    ("hcfa", "hcfa", "F", 9, 42.9),
+    ("wfa", "wfa", "M", 10.5, 8.5),
+])
+def test_float32_regressions(appmod, kind, indicator, gender, age, value):
+    assert _fast(appmod, kind, value, age, gender) == _reference(appmod, indicator, value, age, gender)
+
+
+def test_age_beyond_table_is_none(appmod):
+    assert appmod.calculate_z_score(10.0, None, 61.0, "M", "wfa") is None
+
+
+@pytest.mark.parametrize("age", [0.0, 1.0, 2.5, 2.98])
+def test_hfa_weekly_range_uses_lhfa(appmod, age):
+    # Up to 13 weeks pygrowup uses weekly tables; hfa must still resolve (to calc.lhfa)
+    z = appmod.calculate_z_score(None, 55.0, age, "M", "hfa")
+    assert z is not None
+    assert float(z) == _reference(appmod, "lhfa", 55.0, age, "M")
+
+
+def test_hfa_api_in_weekly_range(client):
+    r = client.post("/api/calculate-zscore", json={"weight": 4.5, "height": 55.0, "age_months": 1,
+                                                     "gender": "M", "type": "hfa"})
+    assert r.status_code == 200
+    assert isinstance(r.get_json()["z_score"], float)
+
+
+@pytest.mark.parametrize("kind, indicator, bounds", KINDS)
+def test_batch_matches_scalar(appmod, kind, indicator, bounds):
+    np = pytest.importorskip("numpy")
+    rng = random.Random(f"batch-{kind}")
+    low, high = bounds
+    for gender in "MF":
+        ages = [round(rng.uniform(0.0, 62.0), 1) for _ in range(400)] + [None, 10.5]
+        values = [round(rng.uniform(low, high), 1) for _ in range(400)] + [10.0, None]
+        batch = appmod.batch_z_scores([np.nan if v is None else v for v in values],
+                                      [np.nan if a is None else a for a in ages], gender, kind)
+        for value, age, z in zip(values, ages, batch):
+            single = None if age is None else _fast(appmod, kind, value, age, gender)
+            if single is None:
+                assert np.isnan(z), (kind, gender, age, value)
+            else:
+                assert z == float(single), (kind, gender, age, value)
+
+
+def test_batch_uses_floor_month_row(appmod):
+    # np.interp between month rows gave -0.81 here; the scalar path (and pygrowup) say -0.69
+    assert appmod.batch_z_scores([8.5], [10.5], "M", "wfa")[0] == -0.69
+
+
+def test_report_rows_use_cohort_z_scores(appmod):
+    records = [
+        {"name": "a", "age_months": 10.5, "gender": "m", "weight": 8.5, "height": 70},
+        {"name": "b", "age_months": None, "gender": "X", "weight": "x"},
+        {"name": "c", "age_months": 1, "gender": "F", "weight": "4", "height": 52},
+    ]
+    rows = list(appmod.iter_report_rows(records))
+    assert rows[0][5:] == [-0.69, float(_fast(appmod, "hfa", 70.0, 10.5, "M")), "Gizi Baik"]
+    assert rows[1][5:] == ["", "", "Tidak dapat dinilai"]
+    assert rows[2][5] == float(_fast(appmod, "wfa", 4.0, 1.0, "F"))
+
+
+def test_round2_matches_round_on_quantized_scores(appmod):
+    # Both z-score sources are already quantized to 0.01 (compiled path rounds, pygrowup quantizes)
+    from decimal import Decimal
+    rng = random.Random("round2")
+    for _ in range(100_000):
+        x = round(rng.uniform(-6.0, 6.0), 2)
+        assert appmod._round2(x) == round(x, 2), x
+    assert appmod._round2(Decimal("-1.25")) == -1.25
+
+
+def test_round2_array_matches_round2(appmod):
+    np = pytest.importorskip("numpy")
+    rng = random.Random("round2-array")
+    xs = [rng.uniform(-6.0, 6.0) for _ in range(20_000)] + [0.125, -0.125, 2.675, -0.005, 0.0]
+    assert appmod._round2_array(np.array(xs)).tolist() == [appmod._round2(x) for x in xs]
+
+
+def test_non_finite_value_is_none(appmod):
+    assert appmod.calculate_z_score(float("inf"), None, 10.0, "M", "wfa") is None
+
+
+@pytest.mark.parametrize("body", [
+    {"weight": "inf", "age_months": 10},
+    {"weight": 8.5, "age_months": "nan"},
+    {"weight": 8.5, "height": "1e999", "age_months": 10, "type": "hfa"},
+])
+def test_api_rejects_non_finite_inputs(client, body):
+    r = client.post("/api/calculate-zscore", json=body)
+    assert r.status_code == 400
+    assert "finite" in r.get_json()["error"]
+
+
+def test_round2_extreme_values_do_not_overflow(appmod):
+    assert appmod._round2(1e307) == 1e307
+    assert appmod._round2(-1e307) == -1e307
+    assert appmod._round2(float("inf")) == float("inf")
+
+
+def test_api_extreme_finite_input_is_not_500(client):
+    r = client.post("/api/calculate-zscore", json={"type": "hfa", "height": 1e307, "age_months": 12,
+                                                     "weight": 10, "gender": "M"})
+    assert r.status_code == 200
+    assert r.get_json()["classification"]["category"] == "obese"
+
+
+@pytest.mark.parametrize("kind, expected", [
+    ("wfh", lambda calc: calc.wfh(10.0, 24, "M", height=85.0)),
+    ("bfa", lambda calc: calc.bmifa(10.0 / 0.85 ** 2, 24, "M")),
+])
+def test_wfh_and_bfa_dispatch(appmod, client, kind, expected):
+    assert appmod.calculate_z_score(10.0, 85.0, 24, "M", kind) == expected(appmod.calc)
+    r = client.post("/api/calculate-zscore", json={"weight": 10.0, "height": 85.0, "age_months": 24,
+                                                     "gender": "M", "type": kind})
+    assert r.status_code == 200
+    assert r.get_json()["z_score"] == float(expected(appmod.calc))
+
+
+def test_cache_key_ignores_unused_input(appmod, client):
+    appmod.calculate_z_score_cached.cache_clear()
+    for height in (70.0, 71.0, None):
+        r = client.post("/api/calculate-zscore", json={"weight": 8.5, "height": height,
+                                                         "age_months": 10.5, "gender": "M"})
+        assert r.get_json()["z_score"] == -0.69
+    info = appmod.calculate_z_score_cached.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+
+
+@pytest.mark.parametrize("z", [None, float("nan"), -3.5, 0.0, 2.5])
+def test_classify_nutrition_has_the_same_keys(appmod, z):
+    assert set(appmod.classify_nutrition(z)) == {"status", "color", "category", "percentile"}